@@ -1,3 +1,4 @@
+import array
 import unittest
 import xdrlib
 
@@ -53,6 +54,345 @@ class XDRTest(unittest.TestCase):
         up.done()
         self.assertRaises(EOFError, up.unpack_uint)
 
+    def test_buffer_growth(self):
+        p = xdrlib.Packer()
+        for i in range(1000):
+            p.pack_uhyper(i)
+        p.pack_fopaque(3, b"abc")
+        data = p.get_buffer()
+        self.assertEqual(len(data), 8004)
+
+        up = xdrlib.Unpacker(data)
+        for i in range(1000):
+            self.assertEqual(up.unpack_uhyper(), i)
+        self.assertEqual(up.unpack_fopaque(3), b"abc")
+        up.done()
+
+    def test_get_buffer_snapshot(self):
+        p = xdrlib.Packer()
+        p.pack_uint(1)
+        first = p.get_buffer()
+        p.pack_uint(2)
+        self.assertEqual(first, b"\0\0\0\1")
+        self.assertEqual(p.get_buffer(), b"\0\0\0\1\0\0\0\2")
+        p.reset()
+        self.assertEqual(p.get_buffer(), b"")
+
+    def test_reset_reuse(self):
+        p = xdrlib.Packer()
+        p.pack_fopaque(1000, b"\xff" * 1000)
+        first = p.get_buffer()
+        p.reset()
+        p.pack_fopaque(1, b"a")
+        p.pack_bool(False)
+        self.assertEqual(p.get_buffer(), b"a\0\0\0\0\0\0\0")
+        self.assertEqual(first, b"\xff" * 1000)
+
+    def test_reset_override(self):
+        class Counting(xdrlib.Packer):
+            def reset(self):
+                super().reset()
+                self.count = 0
+
+        p = Counting()
+        self.assertEqual(p.count, 0)
+        p.count = 3
+        p.reset()
+        self.assertEqual(p.count, 0)
+
+    def test_short_read(self):
+        up = xdrlib.Unpacker(b"\0\0\0\1\0\0")
+        self.assertRaises(EOFError, up.unpack_hyper)
+        self.assertEqual(up.get_position(), 0)
+        self.assertEqual(up.unpack_uint(), 1)
+        self.assertRaises(EOFError, up.unpack_int)
+        self.assertEqual(up.get_position(), 4)
+
+        up = xdrlib.Unpacker(b"\0\0\0\5hello")
+        self.assertRaises(EOFError, up.unpack_string)
+
+    def test_memoryview_input(self):
+        p = xdrlib.Packer()
+        p.pack_uint(7)
+        p.pack_fopaque(5, b"hello")
+        p.pack_array([b"abcd", b"efgh"], lambda x: p.pack_fopaque(4, x))
+        data = p.get_buffer()
+
+        up = xdrlib.Unpacker(memoryview(data))
+        self.assertEqual(up.unpack_uint(), 7)
+        self.assertEqual(up.unpack_fopaque(5), b"hello")
+        self.assertIsInstance(up.unpack_fstring(0), bytes)
+        views = up.unpack_array(lambda: up.unpack_fopaque_view(4))
+        self.assertTrue(all(isinstance(v, memoryview) for v in views))
+        self.assertEqual([bytes(v) for v in views], [b"abcd", b"efgh"])
+        up.done()
+
+    def test_fstring_view(self):
+        up = xdrlib.Unpacker(bytearray(b"abc\0def\0"))
+        view = up.unpack_fstring_view(3)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view, b"abc")
+        self.assertEqual(up.get_position(), 4)
+        self.assertRaises(EOFError, up.unpack_fstring_view, 5)
+        self.assertEqual(up.unpack_fstring(3), b"def")
+        up.done()
+
+    def test_enum(self):
+        p = xdrlib.Packer()
+        p.pack_enum(-3)
+        p.pack_enum(7)
+        up = xdrlib.Unpacker(p.get_buffer())
+        self.assertEqual(up.unpack_enum(), -3)
+        self.assertEqual(up.unpack_enum(), 7)
+        up.done()
+
+    def test_subclass_overrides(self):
+        class Packer(xdrlib.Packer):
+            def pack_int(self, x):
+                super().pack_int(x + 1)
+
+            def pack_fstring(self, length, data):
+                super().pack_fstring(length, data.upper())
+
+        class Unpacker(xdrlib.Unpacker):
+            def unpack_int(self):
+                return super().unpack_int() - 1
+
+        p = Packer()
+        p.pack_enum(1)
+        p.pack_opaque(b"ab")
+        p.pack_int(0)
+        self.assertEqual(p.get_buffer(), b"\0\0\0\2\0\0\0\2AB\0\0\0\0\0\1")
+
+        up = Unpacker(p.get_buffer())
+        self.assertEqual(up.unpack_enum(), 1)
+        up.unpack_opaque()
+        self.assertTrue(up.unpack_bool() is False)
+
+        class StringUnpacker(xdrlib.Unpacker):
+            def unpack_uint(self):
+                return super().unpack_uint() - 1
+
+            def unpack_fstring(self, n):
+                return super().unpack_fstring(n).upper()
+
+        p = xdrlib.Packer()
+        p.pack_string(b"ab")
+        p.pack_opaque(b"cd")
+        up = StringUnpacker(p.get_buffer())
+        self.assertEqual(up.unpack_string(), b"A")
+        up.set_position(8)
+        self.assertEqual(up.unpack_opaque(copy=False), b"c")
+
+    def test_bulk_unpack(self):
+        p = xdrlib.Packer()
+        p.pack_array(range(5), p.pack_uint)
+        p.pack_farray(2, [-1, 1], p.pack_int)
+        p.pack_array([2**64 - 1, 0], p.pack_uhyper)
+        p.pack_farray(2, [-(2**63), 3], p.pack_hyper)
+        p.pack_array([0.5, -2.0], p.pack_float)
+        p.pack_farray(1, [1.9], p.pack_double)
+
+        up = xdrlib.Unpacker(p.get_buffer())
+        self.assertEqual(up.unpack_uint_array(), [0, 1, 2, 3, 4])
+        self.assertEqual(up.unpack_int_farray(2), [-1, 1])
+        self.assertEqual(up.unpack_uhyper_array(), [2**64 - 1, 0])
+        self.assertEqual(up.unpack_hyper_farray(2), [-(2**63), 3])
+        self.assertEqual(up.unpack_float_array(), [0.5, -2.0])
+        self.assertEqual(up.unpack_double_farray(1), [1.9])
+        self.assertEqual(up.unpack_double_farray(0), [])
+        up.done()
+        self.assertRaises(EOFError, up.unpack_uint_farray, 1)
+        self.assertRaises(ValueError, up.unpack_uint_farray, -1)
+
+    def test_fopaque_padding(self):
+        p = xdrlib.Packer()
+        for n in range(6):
+            p.pack_fopaque(n, b"x" * n)
+        p.pack_fopaque(2, b"truncated")
+        self.assertEqual(
+            p.get_buffer(),
+            b"x\0\0\0xx\0\0xxx\0xxxxxxxxx\0\0\0tr\0\0",
+        )
+        self.assertRaises(ValueError, p.pack_fopaque, 3, b"ab")
+        self.assertRaises(ValueError, p.pack_fopaque, -1, b"")
+
+    def test_fopaque_input_types(self):
+        p = xdrlib.Packer()
+        items = array.array("I", [1, 2])
+        p.pack_fopaque(len(items) * items.itemsize, items)
+        p.pack_opaque(bytearray(b"ab"))
+        p.pack_opaque(items)
+        self.assertEqual(
+            p.get_buffer(),
+            items.tobytes() + b"\0\0\0\2ab\0\0\0\0\0\x08" + items.tobytes(),
+        )
+        self.assertRaises(ValueError, p.pack_fopaque, 8, array.array("I", [1]))
+        self.assertRaises(TypeError, p.pack_fopaque, 2, [1, 2])
+        self.assertRaises(TypeError, p.pack_opaque, [1, 2])
+        self.assertRaises(TypeError, p.pack_fstring, 2, "ab")
+        self.assertEqual(len(p.get_buffer()), 28)
+
+    def test_bulk_pack(self):
+        p = xdrlib.Packer()
+        p.pack_uint_array(range(5))
+        p.pack_int_farray(2, [-1, 1])
+        p.pack_bool_array([True, 0, "x"])
+        p.pack_uhyper_farray(2, [2**64 - 1, 0])
+        p.pack_hyper_array([-(2**63), 3])
+        p.pack_float_farray(2, [0.5, -2.0])
+        p.pack_double_array([1.9])
+        self.assertRaises(ValueError, p.pack_uint_farray, 2, [1])
+
+        q = xdrlib.Packer()
+        q.pack_array(range(5), q.pack_uint)
+        q.pack_farray(2, [-1, 1], q.pack_int)
+        q.pack_array([True, 0, "x"], q.pack_bool)
+        q.pack_farray(2, [2**64 - 1, 0], q.pack_uhyper)
+        q.pack_array([-(2**63), 3], q.pack_hyper)
+        q.pack_farray(2, [0.5, -2.0], q.pack_float)
+        q.pack_array([1.9], q.pack_double)
+        self.assertEqual(p.get_buffer(), q.get_buffer())
+
+        up = xdrlib.Unpacker(p.get_buffer())
+        up.unpack_uint_array()
+        up.unpack_int_farray(2)
+        self.assertEqual(up.unpack_bool_array(), [True, False, True])
+
+    def test_array_specialization(self):
+        class Doubling(xdrlib.Packer):
+            def pack_uint(self, x):
+                super().pack_uint(2 * x)
+
+        p = Doubling()
+        p.pack_farray(2, [1, 2], p.pack_uint)
+        p.pack_farray(1, [-3], p.pack_enum)
+        xdrlib.Packer().pack_farray(1, [4], p.pack_uint)
+
+        up = xdrlib.Unpacker(p.get_buffer() + b"\0\0\0\5")
+        self.assertEqual(up.unpack_farray(2, up.unpack_uint), [2, 4])
+        self.assertEqual(up.unpack_farray(1, up.unpack_enum), [-3])
+        self.assertEqual(up.unpack_farray(1, up.unpack_uint), [8])
+        self.assertEqual(up.unpack_farray(-1, up.unpack_uint), [])
+        self.assertRaises(EOFError, up.unpack_farray, 2, up.unpack_uint)
+        self.assertEqual(up.get_position(), 16)
+        self.assertEqual(up.unpack_farray(1, up.unpack_uint), [5])
+        up.done()
+
+        class Offset(xdrlib.Unpacker):
+            def unpack_int(self):
+                return super().unpack_int() - 1
+
+        up = Offset(b"\0\0\0\1\0\0\0\1")
+        self.assertEqual(up.unpack_farray(2, up.unpack_bool), [False, False])
+
+    def test_record(self):
+        record = xdrlib.compile_record(
+            ["uint", "int", ("fopaque", 6), "uhyper", ("fstring", 4), "double"]
+        )
+        values = (7, -7, b"opaque", 2**64 - 1, b"abcd", 1.5)
+
+        p = xdrlib.Packer()
+        p.pack_record(record, values)
+        q = xdrlib.Packer()
+        q.pack_uint(7)
+        q.pack_int(-7)
+        q.pack_fopaque(6, b"opaque")
+        q.pack_uhyper(2**64 - 1)
+        q.pack_fstring(4, b"abcd")
+        q.pack_double(1.5)
+        self.assertEqual(p.get_buffer(), q.get_buffer())
+
+        up = xdrlib.Unpacker(p.get_buffer())
+        self.assertEqual(up.unpack_record(record), values)
+        up.done()
+        self.assertRaises(EOFError, up.unpack_record, record)
+        for field in ("string", ["fopaque", 4], ("fopaque",), ("fopaque", "4"), 4):
+            self.assertRaises(ValueError, xdrlib.compile_record, [field])
+        self.assertRaises(ValueError, xdrlib.compile_record, [("fstring", -1)])
+        self.assertRaises(ValueError, p.pack_record, record, values[:4] + (b"a", 1.5))
+        self.assertRaises(ValueError, p.pack_fstring, 4, b"a")
+        self.assertRaises(xdrlib.ConversionError, p.pack_record, record, values[:2])
+
+        opaque = xdrlib.compile_record([("fopaque", 4)])
+        items = array.array("I", [1])
+        for data in (memoryview(b"abcd"), bytearray(b"abcd"), items):
+            p = xdrlib.Packer()
+            q = xdrlib.Packer()
+            p.pack_record(opaque, [data])
+            q.pack_fopaque(4, data)
+            self.assertEqual(p.get_buffer(), q.get_buffer())
+        for data in (5, "abcd", [1, 2, 3, 4]):
+            self.assertRaises(TypeError, p.pack_record, opaque, [data])
+            self.assertRaises(TypeError, p.pack_fopaque, 4, data)
+        self.assertRaises(
+            xdrlib.ConversionError, p.pack_record, record, ("x",) + values[1:]
+        )
+
+    def test_bulk_all_or_nothing(self):
+        p = xdrlib.Packer()
+        self.assertRaises(xdrlib.ConversionError, p.pack_int_array, [1, 2**31])
+        self.assertEqual(p.get_buffer(), b"")
+        p.pack_int_array([1, 2])
+
+        up = xdrlib.Unpacker(p.get_buffer()[:-1])
+        self.assertRaises(EOFError, up.unpack_int_array)
+        self.assertEqual(up.get_position(), 0)
+        self.assertRaises(EOFError, xdrlib.Unpacker(b"\0").unpack_uint_array)
+
+    def test_opaque_no_copy(self):
+        p = xdrlib.Packer()
+        p.pack_opaque(b"hello")
+        p.pack_string(b"abcd")
+        up = xdrlib.Unpacker(p.get_buffer())
+        view = up.unpack_opaque(copy=False)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view, b"hello")
+        self.assertEqual(up.get_position(), 12)
+        self.assertEqual(up.unpack_string(copy=True), b"abcd")
+        up.done()
+
+    def test_iter(self):
+        p = xdrlib.Packer()
+        p.pack_list([b"a", b"b"], p.pack_string)
+        p.pack_array([5, 6, 7], p.pack_uint)
+        p.pack_uint(2)
+
+        up = xdrlib.Unpacker(p.get_buffer())
+        items = up.iter_list(up.unpack_string)
+        self.assertEqual(next(items), b"a")
+        self.assertEqual(up.get_position(), 12)
+        self.assertEqual(list(items), [b"b"])
+        self.assertEqual(list(up.iter_array(up.unpack_uint)), [5, 6, 7])
+        self.assertRaises(xdrlib.ConversionError, list, up.iter_list(up.unpack_uint))
+
+    def test_buffer_arrays(self):
+        cases = [
+            ("I", [0, 1, 2**32 - 1], "pack_uint"),
+            ("i", [-(2**31), 0, 2**31 - 1], "pack_int"),
+            ("Q", [0, 2**64 - 1], "pack_uhyper"),
+            ("q", [-(2**63), 2**63 - 1], "pack_hyper"),
+            ("f", [0.5, -2.0], "pack_float"),
+            ("d", [1.9, -0.0], "pack_double"),
+        ]
+        for typecode, values, method in cases:
+            p = xdrlib.Packer()
+            q = xdrlib.Packer()
+            items = array.array(typecode, values)
+            p.pack_array(items, getattr(p, method))
+            p.pack_farray(len(items), memoryview(items), getattr(p, method))
+            q.pack_array(values, getattr(q, method))
+            q.pack_farray(len(values), values, getattr(q, method))
+            self.assertEqual(p.get_buffer(), q.get_buffer(), typecode)
+
+        # A buffer of the wrong signedness is range-checked item by item.
+        p = xdrlib.Packer()
+        p.pack_uint_array(array.array("i", [1, 2]))
+        self.assertEqual(xdrlib.Unpacker(p.get_buffer()).unpack_uint_array(), [1, 2])
+        self.assertRaises(
+            xdrlib.ConversionError, p.pack_uint_array, array.array("i", [-1])
+        )
+
 
 class ConversionErrorTest(unittest.TestCase):
 
@@ -77,6 +417,16 @@ class ConversionErrorTest(unittest.TestCase):
     def test_uhyper(self):
         self.assertRaisesConversion(self.packer.pack_uhyper, "string")
 
+    def test_hyper(self):
+        self.assertRaisesConversion(self.packer.pack_hyper, 2**63)
+
+    def test_enum(self):
+        self.assertRaisesConversion(self.packer.pack_enum, "string")
+
+    def test_bulk(self):
+        self.assertRaisesConversion(self.packer.pack_uint_array, [1, -1])
+        self.assertRaisesConversion(self.packer.pack_double_farray, 1, ["x"])
+
 
 if __name__ == "__main__":
     unittest.main()
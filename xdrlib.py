@@ -4,9 +4,10 @@ See: RFC 1014
 
 """
 
+import array
 from io import BytesIO
-from functools import wraps
 import struct
+import sys
 import typing
 import warnings
 
@@ -15,7 +16,19 @@ __version__ = "4.0.2"
 
 
 # Control * exports.
-__all__ = ["Error", "Packer", "Unpacker", "ConversionError"]
+__all__ = ["Error", "Packer", "Unpacker", "ConversionError", "compile_record"]
+
+
+# Precompiled codecs for the scalar types.
+_U32 = struct.Struct(">L")
+_I32 = struct.Struct(">l")
+_U64 = struct.Struct(">Q")
+_I64 = struct.Struct(">q")
+_F32 = struct.Struct(">f")
+_F64 = struct.Struct(">d")
+
+# Padding required after n octets of opaque data, indexed by n % 4.
+_PADS = (b"", b"\0\0\0", b"\0\0", b"\0")
 
 
 # Exceptions
@@ -44,17 +57,111 @@ class ConversionError(Error):
     """Error during conversion to or from XDR format."""
 
 
-def raise_conversion_error(function):
-    """Wrap any raised struct.errors in a ConversionError."""
+# struct format characters for the scalar types usable in a record.
+_RECORD_CODES = {
+    "uint": "L",
+    "int": "l",
+    "enum": "l",
+    "uhyper": "Q",
+    "hyper": "q",
+    "float": "f",
+    "double": "d",
+}
 
-    @wraps(function)
-    def result(self, value):
-        try:
-            return function(self, value)
-        except struct.error as e:
-            raise ConversionError(e.args[0]) from None
 
-    return result
+class _Record(struct.Struct):
+    """Codec for a record layout built by compile_record().
+
+    Public ivars:
+        opaques -- (index, length) of each fixed opaque field"""
+
+    def __init__(self, fmt: str, opaques: typing.Tuple):
+        super().__init__(fmt)
+        self.opaques = opaques
+
+
+def compile_record(fields: typing.Sequence) -> struct.Struct:
+    """Compile a fixed-layout record into a single codec.
+
+    Each field is either the name of a scalar type ("uint", "int",
+    "enum", "uhyper", "hyper", "float" or "double"), or a tuple of
+    ("fopaque", n) or ("fstring", n) for a fixed-length opaque of n
+    octets.  The result can be passed to Packer.pack_record() and
+    Unpacker.unpack_record(), which then encode or decode the whole
+    record in a single call.
+
+    compile_record(["uint", "uint", ("fopaque", 16), "uhyper"])
+
+    As with pack_fopaque(), a fixed opaque value shorter than n octets
+    raises ValueError, and a longer one is truncated.
+
+    :param fields: Sequence of field types, in wire order"""
+    fmt = ">"
+    opaques = []
+    for index, field in enumerate(fields):
+        if isinstance(field, tuple):
+            if (
+                len(field) != 2
+                or field[0] not in ("fopaque", "fstring")
+                or not isinstance(field[1], int)
+            ):
+                raise ValueError(f"unsupported record field {field!r}")
+            n = field[1]
+            if n < 0:
+                raise ValueError(f"data size {n} must not be negative")
+            fmt += f"{n}s{len(_PADS[n & 3])}x"
+            opaques.append((index, n))
+        elif isinstance(field, str) and field in _RECORD_CODES:
+            fmt += _RECORD_CODES[field]
+        else:
+            raise ValueError(f"unsupported record field {field!r}")
+    return _Record(fmt, tuple(opaques))
+
+
+def _as_octets(data: typing.Any) -> typing.Union[bytes, memoryview]:
+    """Return data as a sequence of octets, suitable for copying into
+    a packing buffer.
+
+    Buffers with wider items, such as array.array("I"), are viewed as
+    their underlying octets.  Objects that are not buffers, such as
+    lists or str, raise TypeError."""
+    if isinstance(data, bytes):
+        return data
+    return memoryview(data).cast("B")
+
+
+# Native buffer formats whose items can be packed as each struct code.
+_BUFFER_FORMATS = {
+    "L": "ILQ",
+    "l": "ilq",
+    "Q": "ILQ",
+    "q": "ilq",
+    "f": "f",
+    "d": "d",
+}
+
+
+def _native_view(seq: typing.Any, code: str, size: int) -> typing.Optional[memoryview]:
+    """Return a memoryview of seq if it is a contiguous buffer of
+    native-order items that can be packed as code, otherwise None.
+
+    This matches array.array values, and NumPy arrays of the
+    corresponding dtype, without depending upon NumPy."""
+    try:
+        view = memoryview(seq)
+    except TypeError:
+        return None
+    fmt = view.format.lstrip("@")
+    if (
+        view.ndim == 1
+        and view.c_contiguous
+        and view.itemsize == size
+        and len(fmt) == 1
+        and fmt in _BUFFER_FORMATS[code]
+    ):
+        return view
+    view.release()
+    return None
 
 
 class Packer:
@@ -69,7 +176,7 @@ class Packer:
         self.__buf = BytesIO()
 
     def get_buffer(self) -> bytes:
-        """Return the packed data."""
+        """Return a copy of the packed data."""
         return self.__buf.getvalue()
 
     def get_buf(self) -> bytes:
@@ -84,15 +191,19 @@ class Packer:
 
         return self.get_buffer()
 
-    @raise_conversion_error
     def pack_uint(self, x: int):
         """Pack a 32-bit unsigned integer value."""
-        self.__buf.write(struct.pack(">L", x))
+        try:
+            self.__buf.write(_U32.pack(x))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
 
-    @raise_conversion_error
     def pack_int(self, x: int):
         """Pack a 32-bit signed integer value."""
-        self.__buf.write(struct.pack(">l", x))
+        try:
+            self.__buf.write(_I32.pack(x))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
 
     def pack_enum(self, x: int):
         """Pack an enumeration value."""
@@ -105,25 +216,33 @@ class Packer:
         else:
             self.__buf.write(b"\0\0\0\0")
 
-    @raise_conversion_error
     def pack_uhyper(self, x: int):
         """Pack a 64-bit unsigned integer value."""
-        self.__buf.write(struct.pack(">Q", x))
+        try:
+            self.__buf.write(_U64.pack(x))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
 
-    @raise_conversion_error
     def pack_hyper(self, x: int):
         """Pack a 64-bit signed integer value."""
-        self.__buf.write(struct.pack(">q", x))
+        try:
+            self.__buf.write(_I64.pack(x))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
 
-    @raise_conversion_error
     def pack_float(self, x: float):
         """Pack a 32-bit (single-precision) floating point value."""
-        self.__buf.write(struct.pack(">f", x))
+        try:
+            self.__buf.write(_F32.pack(x))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
 
-    @raise_conversion_error
     def pack_double(self, x: float):
         """Pack a 64-bit (double-precision) floating point value."""
-        self.__buf.write(struct.pack(">d", x))
+        try:
+            self.__buf.write(_F64.pack(x))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
 
     def pack_fstring(self, length: int, data: bytes):
         """Pack a fixed-size string value.
@@ -154,6 +273,7 @@ class Packer:
         :param length: size of the input, in bytes
         :param data: bytes value"""
 
+        data = _as_octets(data)
         if length < 0:
             raise ValueError(f"data size {length} must not " "be negative")
         if len(data) < length:
@@ -161,10 +281,10 @@ class Packer:
                 f"data size {len(data)} less than " f"specified size {length}"
             )
 
-        data = data[:length]
-        length = ((length + 3) // 4) * 4
-        data = data + (length - len(data)) * b"\0"
+        if len(data) != length:
+            data = data[:length]
         self.__buf.write(data)
+        self.__buf.write(_PADS[length & 3])
 
     def pack_opaque(self, data: bytes):
         """Pack an opaque value.
@@ -172,7 +292,7 @@ class Packer:
         An XDR opaque value is a sequence of uninterpreted bytes.
 
         :param data: bytes value to pack."""
-        length = len(data)
+        length = len(data) if isinstance(data, bytes) else memoryview(data).nbytes
         self.pack_uint(length)
         self.pack_fstring(length, data)
 
@@ -201,6 +321,28 @@ class Packer:
         :param data: bytes value to pack."""
         self.pack_opaque(data)
 
+    def pack_record(self, record: struct.Struct, values: typing.Sequence):
+        """Pack a record compiled with compile_record().
+
+        :param record: Compiled record layout
+        :param values: Field values, in the order defined by the record"""
+        opaques = getattr(record, "opaques", ())
+        if opaques:
+            values = list(values)
+            for index, length in opaques:
+                if index >= len(values):
+                    continue
+                data = _as_octets(values[index])
+                if len(data) < length:
+                    raise ValueError(
+                        f"data size {len(data)} less than specified size {length}"
+                    )
+                values[index] = bytes(data)
+        try:
+            self.__buf.write(record.pack(*values))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
+
     def pack_list(self, seq: typing.Sequence, pack_item: typing.Callable):
         """Pack a list of items.
 
@@ -221,6 +363,11 @@ class Packer:
         :param pack_item: Function to use to pack items"""
         if len(seq) != length:
             raise ValueError("wrong array size")
+        if getattr(pack_item, "__self__", None) is self:
+            bulk = _BULK_PACKERS.get(pack_item.__func__)
+            if bulk is not None:
+                getattr(self, bulk)(length, seq)
+                return
         for item in seq:
             pack_item(item)
 
@@ -233,16 +380,189 @@ class Packer:
         self.pack_uint(length)
         self.pack_farray(length, seq, pack_item)
 
+    def _pack_bulk(
+        self,
+        length: int,
+        seq: typing.Iterable,
+        code: str,
+        size: int,
+        counted: bool = False,
+    ):
+        """Pack length consecutive scalars of a single type in one call.
+
+        Either the whole array is packed, or nothing is.
+
+        :param length: Integer number of items
+        :param seq: Items to be packed
+        :param code: struct format character for the element type
+        :param size: Encoded size of each element, in octets
+        :param counted: Prefix the items with their count, as an array"""
+        view = _native_view(seq, code, size)
+        if view is not None:
+            with view:
+                self._pack_native(view, counted)
+            return
+        if counted:
+            fmt = f">L{length}{code}"
+            seq = (length, *seq)
+        else:
+            fmt = f">{length}{code}"
+        try:
+            self.__buf.write(struct.pack(fmt, *seq))
+        except struct.error as e:
+            raise ConversionError(e.args[0]) from None
+
+    def _pack_native(self, view: memoryview, counted: bool):
+        """Pack a buffer of native-order items, as from _native_view().
+
+        The items are copied and byte-swapped as a block, without
+        converting each one to a Python object.
+
+        :param view: Contiguous, one-dimensional buffer of items
+        :param counted: Prefix the items with their count, as an array"""
+        items = array.array(view.format.lstrip("@"))
+        items.frombytes(view.cast("B"))
+        if sys.byteorder == "little":
+            items.byteswap()
+        if counted:
+            self.__buf.write(_U32.pack(len(view)))
+        self.__buf.write(items)
+
+    def pack_uint_farray(self, length: int, seq: typing.Sequence[int]):
+        """Pack a fixed-size array of 32-bit unsigned integers.
+
+        Equivalent to pack_farray(length, seq, pack_uint), but packs
+        the whole array in a single call.
+
+        :param length: Integer number of items
+        :param seq: List of items to be packed"""
+        if len(seq) != length:
+            raise ValueError("wrong array size")
+        self._pack_bulk(length, seq, "L", 4)
+
+    def pack_int_farray(self, length: int, seq: typing.Sequence[int]):
+        """Pack a fixed-size array of 32-bit signed integers.
+
+        :param length: Integer number of items
+        :param seq: List of items to be packed"""
+        if len(seq) != length:
+            raise ValueError("wrong array size")
+        self._pack_bulk(length, seq, "l", 4)
+
+    def pack_bool_farray(self, length: int, seq: typing.Sequence):
+        """Pack a fixed-size array of boolean values.
+
+        :param length: Integer number of items
+        :param seq: List of items to be packed"""
+        if len(seq) != length:
+            raise ValueError("wrong array size")
+        self._pack_bulk(length, map(bool, seq), "L", 4)
+
+    def pack_uhyper_farray(self, length: int, seq: typing.Sequence[int]):
+        """Pack a fixed-size array of 64-bit unsigned integers.
+
+        :param length: Integer number of items
+        :param seq: List of items to be packed"""
+        if len(seq) != length:
+            raise ValueError("wrong array size")
+        self._pack_bulk(length, seq, "Q", 8)
+
+    def pack_hyper_farray(self, length: int, seq: typing.Sequence[int]):
+        """Pack a fixed-size array of 64-bit signed integers.
+
+        :param length: Integer number of items
+        :param seq: List of items to be packed"""
+        if len(seq) != length:
+            raise ValueError("wrong array size")
+        self._pack_bulk(length, seq, "q", 8)
+
+    def pack_float_farray(self, length: int, seq: typing.Sequence[float]):
+        """Pack a fixed-size array of single-precision floats.
+
+        :param length: Integer number of items
+        :param seq: List of items to be packed"""
+        if len(seq) != length:
+            raise ValueError("wrong array size")
+        self._pack_bulk(length, seq, "f", 4)
+
+    def pack_double_farray(self, length: int, seq: typing.Sequence[float]):
+        """Pack a fixed-size array of double-precision floats.
+
+        :param length: Integer number of items
+        :param seq: List of items to be packed"""
+        if len(seq) != length:
+            raise ValueError("wrong array size")
+        self._pack_bulk(length, seq, "d", 8)
+
+    def pack_uint_array(self, seq: typing.Sequence[int]):
+        """Pack a variable-length array of 32-bit unsigned integers.
+
+        Equivalent to pack_array(seq, pack_uint), but packs the whole
+        array in a single call.
+
+        :param seq: List of items to be packed"""
+        self._pack_bulk(len(seq), seq, "L", 4, counted=True)
+
+    def pack_int_array(self, seq: typing.Sequence[int]):
+        """Pack a variable-length array of 32-bit signed integers.
+
+        :param seq: List of items to be packed"""
+        self._pack_bulk(len(seq), seq, "l", 4, counted=True)
+
+    def pack_bool_array(self, seq: typing.Sequence):
+        """Pack a variable-length array of boolean values.
+
+        :param seq: List of items to be packed"""
+        self._pack_bulk(len(seq), map(bool, seq), "L", 4, counted=True)
+
+    def pack_uhyper_array(self, seq: typing.Sequence[int]):
+        """Pack a variable-length array of 64-bit unsigned integers.
+
+        :param seq: List of items to be packed"""
+        self._pack_bulk(len(seq), seq, "Q", 8, counted=True)
+
+    def pack_hyper_array(self, seq: typing.Sequence[int]):
+        """Pack a variable-length array of 64-bit signed integers.
+
+        :param seq: List of items to be packed"""
+        self._pack_bulk(len(seq), seq, "q", 8, counted=True)
+
+    def pack_float_array(self, seq: typing.Sequence[float]):
+        """Pack a variable-length array of single-precision floats.
+
+        :param seq: List of items to be packed"""
+        self._pack_bulk(len(seq), seq, "f", 4, counted=True)
+
+    def pack_double_array(self, seq: typing.Sequence[float]):
+        """Pack a variable-length array of double-precision floats.
+
+        :param seq: List of items to be packed"""
+        self._pack_bulk(len(seq), seq, "d", 8, counted=True)
+
+
+# Bulk array packers to use in place of per-item calls to the scalar packers.
+_BULK_PACKERS = {
+    Packer.pack_uint: "pack_uint_farray",
+    Packer.pack_int: "pack_int_farray",
+    Packer.pack_bool: "pack_bool_farray",
+    Packer.pack_uhyper: "pack_uhyper_farray",
+    Packer.pack_hyper: "pack_hyper_farray",
+    Packer.pack_float: "pack_float_farray",
+    Packer.pack_double: "pack_double_farray",
+}
+
 
 class Unpacker:
     """Unpacks various data representations from the given buffer."""
 
-    def __init__(self, data: bytes):
-        """Create an XDR decoder for the supplied buffer."""
+    def __init__(self, data: typing.Union[bytes, bytearray, memoryview]):
+        """Create an XDR decoder for the supplied buffer.
+
+        :param data: bytes, bytearray or (byte-oriented) memoryview"""
         self.__buf = data
         self.__pos = 0
 
-    def reset(self, data):
+    def reset(self, data: typing.Union[bytes, bytearray, memoryview]):
         """Reset the XDR decoder.
 
         :param data: Bytes buffer to be decoded"""
@@ -275,22 +595,22 @@ class Unpacker:
 
         Advances the internal position by 4 octets."""
         i = self.__pos
-        self.__pos = j = i + 4
-        data = self.__buf[i:j]
-        if len(data) < 4:
+        j = i + 4
+        if j > len(self.__buf):
             raise EOFError
-        return struct.unpack(">L", data)[0]
+        self.__pos = j
+        return _U32.unpack_from(self.__buf, i)[0]
 
     def unpack_int(self) -> int:
         """Decode a 32-bit signed integer value at the current position.
 
         Advances the internal position by 4 octets."""
         i = self.__pos
-        self.__pos = j = i + 4
-        data = self.__buf[i:j]
-        if len(data) < 4:
+        j = i + 4
+        if j > len(self.__buf):
             raise EOFError
-        return struct.unpack(">l", data)[0]
+        self.__pos = j
+        return _I32.unpack_from(self.__buf, i)[0]
 
     def unpack_enum(self) -> int:
         """Decode an enumeration value.
@@ -309,22 +629,22 @@ class Unpacker:
 
         Advances the internal position by 8 octets."""
         i = self.__pos
-        self.__pos = j = i + 8
-        data = self.__buf[i:j]
-        if len(data) < 8:
+        j = i + 8
+        if j > len(self.__buf):
             raise EOFError
-        return struct.unpack(">Q", data)[0]
+        self.__pos = j
+        return _U64.unpack_from(self.__buf, i)[0]
 
     def unpack_hyper(self) -> int:
         """Decode a 64 bit signed integer value at the current position.
 
         Advances the internal position by 8 octets."""
         i = self.__pos
-        self.__pos = j = i + 8
-        data = self.__buf[i:j]
-        if len(data) < 8:
+        j = i + 8
+        if j > len(self.__buf):
             raise EOFError
-        return struct.unpack(">q", data)[0]
+        self.__pos = j
+        return _I64.unpack_from(self.__buf, i)[0]
 
     def unpack_float(self) -> float:
         """Decode a 32-bit (single precision) floating point value at
@@ -332,65 +652,117 @@ class Unpacker:
 
         Advances the internal position by 4 octets."""
         i = self.__pos
-        self.__pos = j = i + 4
-        data = self.__buf[i:j]
-        if len(data) < 4:
+        j = i + 4
+        if j > len(self.__buf):
             raise EOFError
-        return struct.unpack(">f", data)[0]
+        self.__pos = j
+        return _F32.unpack_from(self.__buf, i)[0]
 
     def unpack_double(self) -> float:
         """Decode a 64-bit (double precision) floating point value at
         the current position.
 
-        Advances the internal position by 4 octets."""
+        Advances the internal position by 8 octets."""
         i = self.__pos
-        self.__pos = j = i + 8
-        data = self.__buf[i:j]
-        if len(data) < 8:
+        j = i + 8
+        if j > len(self.__buf):
             raise EOFError
-        return struct.unpack(">d", data)[0]
+        self.__pos = j
+        return _F64.unpack_from(self.__buf, i)[0]
 
-    def unpack_fstring(self, n: int):
-        """Decode a fixed-length string at the current position."""
+    def _advance_fstring(self, n: int) -> int:
+        """Skip over a padded fixed-length string, returning its offset."""
         if n < 0:
             raise ValueError("fstring size must be nonnegative")
         i = self.__pos
-        j = i + (n + 3) // 4 * 4
+        j = i + ((n + 3) & ~3)
         if j > len(self.__buf):
             raise EOFError
         self.__pos = j
-        return self.__buf[i : i + n]
+        return i
+
+    def unpack_fstring(self, n: int) -> bytes:
+        """Decode a fixed-length string at the current position."""
+        i = self._advance_fstring(n)
+        data = self.__buf[i : i + n]
+        if isinstance(data, memoryview):
+            return data.tobytes()
+        return data
 
     unpack_fopaque = unpack_fstring
 
-    def unpack_string(self):
-        """Decode a variable-length string from the current position."""
+    def unpack_fstring_view(self, n: int) -> memoryview:
+        """Decode a fixed-length string at the current position, without
+        copying it.
+
+        The returned memoryview refers to the decoding buffer, so it
+        remains valid only for as long as that buffer is unchanged.
+        Where a copy is needed, use unpack_fstring() instead.
+
+        To decode an array of opaque values without copying, pass a
+        function using this method to unpack_farray() or unpack_array():
+
+        unpacker.unpack_array(lambda: unpacker.unpack_fstring_view(16))"""
+        i = self._advance_fstring(n)
+        return memoryview(self.__buf)[i : i + n]
+
+    unpack_fopaque_view = unpack_fstring_view
+
+    def unpack_string(self, *, copy: bool = True) -> typing.Union[bytes, memoryview]:
+        """Decode a variable-length string from the current position.
+
+        :param copy: If false, return a memoryview of the decoding
+        buffer rather than a copy of the data, as for
+        unpack_fstring_view()"""
         n = self.unpack_uint()
+        if not copy:
+            return self.unpack_fstring_view(n)
         return self.unpack_fstring(n)
 
     unpack_opaque = unpack_string
     unpack_bytes = unpack_string
 
+    def unpack_record(self, record: struct.Struct) -> typing.Tuple:
+        """Decode a record compiled with compile_record().
+
+        Returns a tuple of the field values.
+
+        :param record: Compiled record layout"""
+        i = self.__pos
+        j = i + record.size
+        if j > len(self.__buf):
+            raise EOFError
+        self.__pos = j
+        return record.unpack_from(self.__buf, i)
+
     def unpack_list(self, unpack_item: typing.Callable) -> typing.Sequence:
         """Decode a variable-length list.
 
         :param unpack_item: Function to decode items"""
-        seq = []
+        return list(self.iter_list(unpack_item))
+
+    def iter_list(self, unpack_item: typing.Callable) -> typing.Iterator:
+        """Decode a variable-length list, yielding each item as it is
+        decoded rather than building a list.
+
+        :param unpack_item: Function to decode items"""
         while 1:
             x = self.unpack_uint()
             if x == 0:
-                break
+                return
             if x != 1:
                 raise ConversionError(f"0 or 1 expected, got {x}")
-            item = unpack_item()
-            seq.append(item)
-        return seq
+            yield unpack_item()
 
     def unpack_farray(self, n: int, unpack_item: typing.Callable) -> typing.Sequence:
         """Decode fixed-length array.
 
         :param n: Integer number of elements
         :param unpack_item: Function to decode items"""
+        if n > 0 and getattr(unpack_item, "__self__", None) is self:
+            bulk = _BULK_UNPACKERS.get(unpack_item.__func__)
+            if bulk is not None:
+                return getattr(self, bulk)(n)
         seq = []
         for _ in range(n):
             seq.append(unpack_item())
@@ -402,3 +774,136 @@ class Unpacker:
         :param unpack_item: Function to unpack array elements"""
         n = self.unpack_uint()
         return self.unpack_farray(n, unpack_item)
+
+    def iter_array(self, unpack_item: typing.Callable) -> typing.Iterator:
+        """Decode array of items, yielding each item as it is decoded
+        rather than building a list.
+
+        The array length is decoded when the first item is requested.
+
+        :param unpack_item: Function to unpack array elements"""
+        n = self.unpack_uint()
+        for _ in range(n):
+            yield unpack_item()
+
+    def _unpack_bulk(self, n: int, code: str, size: int) -> typing.List:
+        """Decode n consecutive scalars of a single type in one call.
+
+        :param n: Integer number of elements
+        :param code: struct format character for the element type
+        :param size: Encoded size of each element, in octets"""
+        if n < 0:
+            raise ValueError("array size must be nonnegative")
+        i = self.__pos
+        j = i + n * size
+        if j > len(self.__buf):
+            raise EOFError
+        self.__pos = j
+        return list(struct.unpack_from(f">{n}{code}", self.__buf, i))
+
+    def _unpack_bulk_array(self, code: str, size: int) -> typing.List:
+        """Decode a counted array of scalars of a single type in one call.
+
+        The count and the whole array are bounds-checked before anything
+        is decoded, so either all of the array is consumed, or nothing is.
+
+        :param code: struct format character for the element type
+        :param size: Encoded size of each element, in octets"""
+        i = self.__pos
+        j = i + 4
+        if j > len(self.__buf):
+            raise EOFError
+        n = _U32.unpack_from(self.__buf, i)[0]
+        if j + n * size > len(self.__buf):
+            raise EOFError
+        self.__pos = j
+        return self._unpack_bulk(n, code, size)
+
+    def unpack_uint_farray(self, n: int) -> typing.List[int]:
+        """Decode a fixed-length array of 32-bit unsigned integers.
+
+        Equivalent to unpack_farray(n, unpack_uint), but decodes the
+        whole array in a single call.
+
+        :param n: Integer number of elements"""
+        return self._unpack_bulk(n, "L", 4)
+
+    def unpack_int_farray(self, n: int) -> typing.List[int]:
+        """Decode a fixed-length array of 32-bit signed integers.
+
+        :param n: Integer number of elements"""
+        return self._unpack_bulk(n, "l", 4)
+
+    def unpack_bool_farray(self, n: int) -> typing.List[bool]:
+        """Decode a fixed-length array of boolean values.
+
+        :param n: Integer number of elements"""
+        return [bool(x) for x in self._unpack_bulk(n, "l", 4)]
+
+    def unpack_uhyper_farray(self, n: int) -> typing.List[int]:
+        """Decode a fixed-length array of 64-bit unsigned integers.
+
+        :param n: Integer number of elements"""
+        return self._unpack_bulk(n, "Q", 8)
+
+    def unpack_hyper_farray(self, n: int) -> typing.List[int]:
+        """Decode a fixed-length array of 64-bit signed integers.
+
+        :param n: Integer number of elements"""
+        return self._unpack_bulk(n, "q", 8)
+
+    def unpack_float_farray(self, n: int) -> typing.List[float]:
+        """Decode a fixed-length array of single-precision floats.
+
+        :param n: Integer number of elements"""
+        return self._unpack_bulk(n, "f", 4)
+
+    def unpack_double_farray(self, n: int) -> typing.List[float]:
+        """Decode a fixed-length array of double-precision floats.
+
+        :param n: Integer number of elements"""
+        return self._unpack_bulk(n, "d", 8)
+
+    def unpack_uint_array(self) -> typing.List[int]:
+        """Decode a variable-length array of 32-bit unsigned integers.
+
+        Equivalent to unpack_array(unpack_uint), but decodes the
+        whole array in a single call."""
+        return self._unpack_bulk_array("L", 4)
+
+    def unpack_int_array(self) -> typing.List[int]:
+        """Decode a variable-length array of 32-bit signed integers."""
+        return self._unpack_bulk_array("l", 4)
+
+    def unpack_bool_array(self) -> typing.List[bool]:
+        """Decode a variable-length array of boolean values."""
+        return [bool(x) for x in self._unpack_bulk_array("l", 4)]
+
+    def unpack_uhyper_array(self) -> typing.List[int]:
+        """Decode a variable-length array of 64-bit unsigned integers."""
+        return self._unpack_bulk_array("Q", 8)
+
+    def unpack_hyper_array(self) -> typing.List[int]:
+        """Decode a variable-length array of 64-bit signed integers."""
+        return self._unpack_bulk_array("q", 8)
+
+    def unpack_float_array(self) -> typing.List[float]:
+        """Decode a variable-length array of single-precision floats."""
+        return self._unpack_bulk_array("f", 4)
+
+    def unpack_double_array(self) -> typing.List[float]:
+        """Decode a variable-length array of double-precision floats."""
+        return self._unpack_bulk_array("d", 8)
+
+
+# Bulk array decoders to use in place of per-item calls to the scalar decoders.
+# unpack_bool is absent because it decodes through unpack_int, which a
+# subclass may override.
+_BULK_UNPACKERS = {
+    Unpacker.unpack_uint: "unpack_uint_farray",
+    Unpacker.unpack_int: "unpack_int_farray",
+    Unpacker.unpack_uhyper: "unpack_uhyper_farray",
+    Unpacker.unpack_hyper: "unpack_hyper_farray",
+    Unpacker.unpack_float: "unpack_float_farray",
+    Unpacker.unpack_double: "unpack_double_farray",
+}